@@ -1,4 +1,4 @@
-import sys, os
+import sys
 from pathlib import Path
 # Add absolute project root to sys.path for streamlit to work
 PROJECT_ROOT = Path(__file__).parent.resolve().parent
@@ -19,6 +19,7 @@ from agent_storming.persona_agent import PersonaAgent
 from agent_storming.moderator_agent import BrainstormAgent
 from agent_storming.utils import ensure_env
 from agent_storming.config_loader import load_config
+from agent_storming.tracing import instrument_graph
 
 
 def build_graph():
@@ -30,10 +31,6 @@ def build_graph():
 
     ensure_env("OPENAI_API_KEY")
     ensure_env("TAVILY_API_KEY")
-    ensure_env("LANGSMITH_API_KEY")
-
-    os.environ["LANGSMITH_TRACING"] = "true"
-    os.environ["LANGSMITH_PROJECT"] = "agent-storming"
 
     PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
@@ -54,7 +51,9 @@ def build_graph():
         llm=llm,
         tavily_search=tavily_search,
         search_instructions_path=PROMPTS_DIR /"web_search_instructions.txt",
-        opinion_instructions_path=PROMPTS_DIR /"generate_opinion_instructions.txt"
+        opinion_instructions_path=PROMPTS_DIR /"generate_opinion_instructions.txt",
+        RECENT_MESSAGES_IN_PROMPT=config["brainstorm"]["recent_messages_in_prompt"],
+        MAX_MEMORY_ITEMS=config["brainstorm"]["max_persona_memory_items"],
     )
 
     # Build orchestrator
@@ -66,10 +65,11 @@ def build_graph():
         compress_chat_instructions_path=PROMPTS_DIR /"compress_chat_instructions.txt",
         summarize_meeting_instructions_path=PROMPTS_DIR /"summarize_meeting_instructions.txt",
         MAX_MESSAGES_BEFORE_COMPRESSION=config["brainstorm"]["max_messages_before_compression"],
+        MAX_MESSAGES_HARD_LIMIT=config["brainstorm"].get("max_messages_hard_limit"),
     )
 
     # Final graph
-    return brainstorm_agent.build_graph()
+    return instrument_graph(brainstorm_agent.build_graph(), config.get("tracing"))
 
 
 
@@ -5,7 +5,10 @@ Orchestrates a brainstorming session using multiple personas.
 Implements persona coordination, chat compression, and meeting summarization.
 """
 
-from typing import List
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Annotated, Dict, List, Optional, Tuple
 from typing_extensions import TypedDict, Literal
 
 from langgraph.graph import MessagesState, StateGraph
@@ -14,9 +17,17 @@ from langgraph.types import interrupt, Command
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.messages import RemoveMessage
 from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig
 
 from agent_storming.utils import read_file_contents
 from agent_storming.persona_factory import Persona
+from agent_storming.persona_memory import PersonaMemory, merge_persona_memories, update_persona_memories
+
+
+# Background chat compressions of all BrainstormAgent instances share one bounded pool,
+# so building a graph per (Streamlit) session does not leave idle worker threads behind.
+MAX_COMPRESSION_WORKERS = 4
+_compression_executor = ThreadPoolExecutor(max_workers=MAX_COMPRESSION_WORKERS, thread_name_prefix="chat-compression")
 
 
 class BrainStormState(MessagesState):
@@ -26,6 +37,7 @@ class BrainStormState(MessagesState):
     current_persona: Persona 
     human_boss_feedback: str
     summary: str
+    persona_memories: Annotated[Dict[str, PersonaMemory], merge_persona_memories]
    
 
 class BrainstormAgent:
@@ -38,20 +50,35 @@ class BrainstormAgent:
         compress_chat_instructions_path: str,
         summarize_meeting_instructions_path: str,
         MAX_MESSAGES_BEFORE_COMPRESSION: int = 20,
+        MAX_MESSAGES_HARD_LIMIT: Optional[int] = None,
         checkpointer=None,
+        compression_lock=None,
     ):
         self.llm = llm
         self.persona_factory_agent = persona_factory_agent
         self.persona_agent = persona_agent  # Store the agent
         self.MAX_MESSAGES_BEFORE_COMPRESSION = MAX_MESSAGES_BEFORE_COMPRESSION
+        # Above this many messages compression runs synchronously if no background result is available
+        self.MAX_MESSAGES_HARD_LIMIT = MAX_MESSAGES_HARD_LIMIT or 2 * MAX_MESSAGES_BEFORE_COMPRESSION
+        if self.MAX_MESSAGES_HARD_LIMIT <= MAX_MESSAGES_BEFORE_COMPRESSION:
+            raise ValueError(
+                f"MAX_MESSAGES_HARD_LIMIT ({self.MAX_MESSAGES_HARD_LIMIT}) must be greater than "
+                f"MAX_MESSAGES_BEFORE_COMPRESSION ({MAX_MESSAGES_BEFORE_COMPRESSION})"
+            )
         self.checkpointer = checkpointer or MemorySaver()
 
+        # Background compressions that run while the human is thinking, keyed by thread id.
+        # Each entry holds the ids of the compressed messages and the future of the summary.
+        self._pending_compressions: Dict[str, Tuple[List[str], Future]] = {}
+        # Guards the pending compressions; can be replaced e.g. by an instrumented lock
+        self._compression_lock = compression_lock or threading.Lock()
+
         # Load prompt templates during initialization
         self.coordinator_instructions = read_file_contents(coordinator_instructions_path)
         self.compress_chat_instructions = read_file_contents(compress_chat_instructions_path)
         self.summarize_meeting_instructions = read_file_contents(summarize_meeting_instructions_path)
 
-    def coordinate(self, state: BrainStormState) -> Command[Literal["meeting_notes", "active_persona"]]:
+    def coordinate(self, state: BrainStormState, config: RunnableConfig) -> Command[Literal["meeting_notes", "active_persona"]]:
         """
         Node: Coordinate the brainstorm — decide next persona or end meeting.
         Can be interrupted for human feedback.
@@ -60,19 +87,28 @@ class BrainstormAgent:
         response = interrupt("Do you have any comment?")
         human_input = response["human_input"]
 
-        if human_input.strip().lower() == "end":
+        # Apply the compression that ran during the human think-time (if any)
+        meeting_ended = human_input.strip().lower() == "end"
+        messages, removals = self._apply_chat_compression(state["messages"], config, meeting_ended)
+
+        if meeting_ended:
             return Command(
                 goto="meeting_notes",
                 update={
-                    "messages": state["messages"],
+                    "messages": removals + messages,
                     "topic": state["topic"]
                 }
             )
 
-        # Otherwise, update messages with optional human input
-        messages = state["messages"]
+        # Otherwise, update messages and persona memories with optional human input
+        memory_updates = {}
         if human_input.strip() != "":
-            messages = messages + [HumanMessage(content=human_input)]
+            human_message = HumanMessage(content=human_input)
+            messages = messages + [human_message]
+            memory_updates = update_persona_memories(
+                state.get("persona_memories", {}), state["personas"], human_message,
+                max_items=self.persona_agent.MAX_MEMORY_ITEMS,
+            )
 
         # Prepare input for LLM to pick next persona
         topic = state["topic"]
@@ -86,47 +122,99 @@ class BrainstormAgent:
             goto="active_persona",
             update={
                 "current_persona": selected_persona,
-                "messages": messages,
+                "messages": removals + messages,
+                "persona_memories": memory_updates,
                 "topic": topic
             }
         )
 
-    def compress_chat_history(self, state: BrainStormState):
+    def compress_chat_history(self, state: BrainStormState, config: RunnableConfig):
         """
-        Node: Compress older messages when chat gets too long to manage context.
-        Keeps last 2 messages + a summary.
+        Node: Start compressing older messages in the background when chat gets too long.
+        The summary is computed while the coordinator waits for human input and is
+        applied by the coordinator before its next LLM call.
         """
         messages = state["messages"]
 
         if len(messages) <= self.MAX_MESSAGES_BEFORE_COMPRESSION:
             return {}  # No change needed
 
-        # Compress all but the last two messages
-        messages_to_compress = messages[:-2]
+        thread_id = config["configurable"]["thread_id"]
+        with self._compression_lock:
+            if thread_id not in self._pending_compressions:
+                # Compress all but the last two messages
+                messages_to_compress = messages[:-2]
+                future = _compression_executor.submit(self._summarize_messages, messages_to_compress, config)
+                self._pending_compressions[thread_id] = ([m.id for m in messages_to_compress], future)
+
+        return {}
+
+    def _summarize_messages(self, messages: List, config: RunnableConfig) -> AIMessage:
+        """
+        Summarize a list of messages into a single message with the LLM.
+        The node config is passed along so that the call keeps the graph's callbacks (tracing).
+        """
         conversation_text = "\n\n".join(
-            [f"{msg.__class__.__name__}: {msg.content}" for msg in messages_to_compress]
+            [f"{msg.__class__.__name__}: {msg.content}" for msg in messages]
         )
-
         compression_prompt = self.compress_chat_instructions.format(conversation_text=conversation_text)
-        summary_response = self.llm.invoke([HumanMessage(content=compression_prompt)])
+        return self.llm.invoke([HumanMessage(content=compression_prompt)], config)
+
+    def _apply_chat_compression(self, messages: List, config: RunnableConfig, meeting_ended: bool = False):
+        """
+        Replace compressed messages with their summary.
+
+        Uses the background compression for this thread once it has finished (or waits
+        for it when the hard message limit is exceeded). Without a background result,
+        compresses synchronously only when the hard message limit is exceeded.
+        Unfinished compressions are cancelled when the meeting ends, stale ones are dropped.
 
-        # Construct new compressed message list
-        compressed_messages = [summary_response]  # Summary as first message
-        # duplicate the last two messages so that they come after summary with different ids (so that they are not removed in the next step)
-        for msg in messages[-2:]:
+        Returns:
+            The compacted message list and the RemoveMessage instructions for the old messages.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        over_hard_limit = len(messages) > self.MAX_MESSAGES_HARD_LIMIT
+
+        with self._compression_lock:
+            pending = self._pending_compressions.pop(thread_id, None)
+            if pending is not None:
+                compressed_ids, future = pending
+                # Only valid if the compressed messages are still the head of the history
+                if [m.id for m in messages[:len(compressed_ids)]] != compressed_ids:
+                    future.cancel()
+                    pending = None
+                elif not future.done() and not over_hard_limit:
+                    if meeting_ended:
+                        future.cancel()
+                    else:
+                        # Not ready yet and not needed yet, keep it for the next turn
+                        self._pending_compressions[thread_id] = pending
+                    pending = None
+
+        summary, num_compressed = None, 0
+        if pending is not None:
+            compressed_ids, future = pending
+            try:
+                summary, num_compressed = future.result(), len(compressed_ids)
+            except Exception as e:
+                logging.error(f"Background chat compression failed: {e}")
+
+        if summary is None and over_hard_limit:
+            summary, num_compressed = self._summarize_messages(messages[:-2], config), len(messages) - 2
+
+        if summary is None:
+            return messages, []
+
+        # Construct new compressed message list with the summary as first message.
+        # Duplicate the remaining messages so that they come after the summary with different ids
+        compressed_messages = [summary]
+        for msg in messages[num_compressed:]:
             if isinstance(msg, HumanMessage):
                 compressed_messages.append(HumanMessage(content=msg.content))
             else:
                 compressed_messages.append(AIMessage(content=msg.content))
 
-        messages += compressed_messages
-
-        # Return instructions to remove old messages and append new ones
-        return {
-            "messages": [
-                RemoveMessage(id=m.id) for m in messages[:-3]  # Remove all but last 3 (including summary)
-            ]
-        }
+        return compressed_messages, [RemoveMessage(id=m.id) for m in messages]
 
     def summarize_meeting(self, state: BrainStormState):
         """
@@ -4,7 +4,8 @@ Persona agent
 Contains the nodes of the persona agent.
 """
 
-from typing import Optional
+import logging
+from typing import Annotated, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from langgraph.graph import MessagesState, StateGraph
@@ -15,12 +16,15 @@ from langchain_tavily import TavilySearch
 
 from agent_storming.utils import read_file_contents
 from agent_storming.persona_factory import Persona
+from agent_storming.persona_memory import PersonaMemory, merge_persona_memories, update_persona_memories
 
 
 class PersonaState(MessagesState):
     context: str # Source docs
     current_persona: Persona # Expert persona asking questions
     topic: str # Topic of discussion
+    personas: List[Persona] # All personas of the meeting
+    persona_memories: Annotated[Dict[str, PersonaMemory], merge_persona_memories] # Private memory per persona name
 
 
 class SearchQuery(BaseModel):
@@ -34,6 +38,8 @@ class PersonaAgent:
         tavily_search: TavilySearch,
         search_instructions_path: str,
         opinion_instructions_path: str,
+        RECENT_MESSAGES_IN_PROMPT: int = 4,
+        MAX_MEMORY_ITEMS: int = 5,
         checkpointer: Optional[MemorySaver] = None,
     ):
         """
@@ -44,12 +50,18 @@ class PersonaAgent:
             tavily_search: TavilySearch tool instance.
             search_instructions_path: Path to the .txt file for search query generation.
             opinion_instructions_path: Path to the .txt file for opinion generation.
+            RECENT_MESSAGES_IN_PROMPT: Number of latest chat messages sent along with the persona memory.
+            MAX_MEMORY_ITEMS: Number of contribution excerpts / addressed points each persona remembers.
             checkpointer: Optional checkpointing system (default: MemorySaver).
         """
         self.llm = llm
         self.tavily_search = tavily_search
         self.search_instructions = read_file_contents(search_instructions_path)
         self.opinion_instructions = read_file_contents(opinion_instructions_path)
+        if RECENT_MESSAGES_IN_PROMPT < 1:
+            raise ValueError(f"RECENT_MESSAGES_IN_PROMPT must be at least 1, got {RECENT_MESSAGES_IN_PROMPT}")
+        self.RECENT_MESSAGES_IN_PROMPT = RECENT_MESSAGES_IN_PROMPT
+        self.MAX_MEMORY_ITEMS = MAX_MEMORY_ITEMS
         self.checkpointer = checkpointer or MemorySaver()
 
     def search_web(self, state: PersonaState):
@@ -58,11 +70,14 @@ class PersonaAgent:
         """
         topic = state["topic"]
         persona = state["current_persona"]
-        messages = state["messages"]
+        messages = state["messages"][-self.RECENT_MESSAGES_IN_PROMPT:]
+        memory = state.get("persona_memories", {}).get(persona.name, PersonaMemory())
 
         # Generate search query using structured LLM
         structured_llm = self.llm.with_structured_output(SearchQuery)
-        system_message = self.search_instructions.format(topic=topic, persona=persona.to_string())
+        system_message = self.search_instructions.format(
+            topic=topic, persona=persona.to_string(), memory=memory.to_string()
+        )
         search_query_msg = structured_llm.invoke(
             [SystemMessage(content=system_message)] + messages
         )
@@ -92,20 +107,28 @@ class PersonaAgent:
 
     def generate_opinion(self, state: PersonaState):
         """
-        Node: Generate an opinion from the current persona using retrieved context.
+        Node: Generate an opinion from the current persona using retrieved context
+        and its private memory, then remember the new opinion.
         """
         persona = state["current_persona"]
-        messages = state["messages"]
+        messages = state["messages"][-self.RECENT_MESSAGES_IN_PROMPT:]
         context = state["context"]
         topic = state["topic"]
+        memories = state.get("persona_memories", {})
+        memory = memories.get(persona.name, PersonaMemory())
 
         # Generate opinion
         system_message = self.opinion_instructions.format(
-            topic=topic, persona=persona.to_string(), context=context
+            topic=topic, persona=persona.to_string(), context=context, memory=memory.to_string()
         )
         opinion = self.llm.invoke([SystemMessage(content=system_message)] + messages)
 
-        return {"messages": [opinion]}
+        # Update the memory of the speaker and of the personas it addressed
+        updated_memories = update_persona_memories(
+            memories, state.get("personas", []), opinion, speaker=persona, max_items=self.MAX_MEMORY_ITEMS
+        )
+
+        return {"messages": [opinion], "persona_memories": updated_memories}
 
     def build_graph(self):
         """
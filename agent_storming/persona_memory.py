@@ -0,0 +1,165 @@
+"""
+Persona memory
+
+Compact private working memory of each persona: excerpts of its own previous contributions
+and the points other participants addressed to it. Memories are updated incrementally from
+each new message, so prompts don't need the full shared chat history.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from langchain_core.messages import BaseMessage
+
+from agent_storming.persona_factory import Persona
+
+
+# Maximum length of a single remembered excerpt or point
+MAX_ITEM_CHARS = 400
+
+# Honorifics that are not used to address a persona on their own
+TITLES = {"dr", "prof", "professor", "mr", "mrs", "ms", "mx", "miss", "sir", "dame"}
+
+
+class PersonaMemory(BaseModel):
+    stance_excerpts: List[str] = Field(
+        default_factory=list,
+        description="Excerpts of the persona's previous contributions: opening stance and conclusion.",
+    )
+    addressed_points: List[str] = Field(
+        default_factory=list,
+        description="Points, questions or comments other participants addressed to the persona.",
+    )
+
+    def to_string(self) -> str:
+        stance_excerpts = "\n".join(f"- {p}" for p in self.stance_excerpts) or "- (none yet)"
+        addressed_points = "\n".join(f"- {p}" for p in self.addressed_points) or "- (none yet)"
+        return (
+            f"Excerpts of your previous contributions (stance ... conclusion):\n{stance_excerpts}\n"
+            f"Points addressed to you:\n{addressed_points}\n"
+        )
+
+
+def merge_persona_memories(
+    left: Optional[Dict[str, PersonaMemory]], right: Optional[Dict[str, PersonaMemory]]
+) -> Dict[str, PersonaMemory]:
+    """Reducer: merge updated persona memories into the existing ones."""
+    return {**(left or {}), **(right or {})}
+
+
+def _shorten(text: str, max_chars: int = MAX_ITEM_CHARS) -> str:
+    """Collapse whitespace and cut the text at a sentence boundary if it is too long."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    sentence_end = max(cut.rfind(". "), cut.rfind("? "), cut.rfind("! "))
+    if sentence_end > 0:
+        return cut[:sentence_end + 1]
+    return cut.rstrip() + "…"
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text into sentences, without splitting after titles such as 'Dr.'."""
+    sentences = []
+    for fragment in re.split(r"(?<=[.!?])\s+|\n+", text):
+        fragment = fragment.strip()
+        if not fragment:
+            continue
+        if sentences and sentences[-1].endswith(".") and sentences[-1].split()[-1].rstrip(".").lower() in TITLES:
+            sentences[-1] = f"{sentences[-1]} {fragment}"
+        else:
+            sentences.append(fragment)
+    return sentences
+
+
+def _name_parts(persona: Persona) -> List[str]:
+    return [part for part in persona.name.split() if part.rstrip(".").lower() not in TITLES]
+
+
+def _mentions_full_name(text: str, persona: Persona) -> bool:
+    """Whether the text contains the persona's full name, with or without titles (case-sensitive)."""
+    names = {persona.name, " ".join(_name_parts(persona))} - {""}
+    return any(re.search(rf"(?<!\w){re.escape(name)}(?!\w)", text) for name in names)
+
+
+def _mentions(text: str, persona: Persona) -> bool:
+    """
+    Whether a sentence addresses the persona: by full name (with or without titles),
+    by title and last name ("Dr. Long"), or by given name used as a vocative
+    ("Will, ...", "..., Will?", "@Will"). Matching is case-sensitive, so names that
+    are ordinary words ("will", "grace") don't count.
+    """
+    name_parts = _name_parts(persona)
+    if not name_parts:
+        return False
+    if _mentions_full_name(text, persona):
+        return True
+
+    given_name, last_name = re.escape(name_parts[0]), re.escape(name_parts[-1])
+    titles = "|".join(title.capitalize() for title in TITLES)
+    if len(name_parts) > 1 and re.search(rf"(?<!\w)(?:{titles})\.?\s+{last_name}(?!\w)", text):
+        return True
+    return bool(
+        re.search(rf"@{given_name}(?!\w)", text)
+        or re.search(rf"(?:^|,)\s*{given_name}\s*(?:[,:!?]|\.?$)", text)
+    )
+
+
+def _stance_excerpt(content: str, speaker: Persona) -> str:
+    """
+    Excerpt of a contribution: its first sentence after the self-introduction (usually
+    the stance) and its last statement (usually the conclusion).
+    """
+    sentences = [s for s in _split_sentences(content) if not _mentions_full_name(s, speaker)]
+    if not sentences:
+        return _shorten(content)
+
+    opening = _shorten(sentences[0], MAX_ITEM_CHARS // 2)
+    statements = [s for s in sentences[1:] if not s.endswith("?")]
+    if not statements:
+        return opening
+    return f"{opening} ... {_shorten(statements[-1], MAX_ITEM_CHARS // 2)}"
+
+
+def update_persona_memories(
+    memories: Dict[str, PersonaMemory],
+    personas: List[Persona],
+    message: BaseMessage,
+    speaker: Optional[Persona] = None,
+    max_items: int = 5,
+) -> Dict[str, PersonaMemory]:
+    """
+    Update the persona memories with a single new message.
+
+    The speaker (if it is a persona) remembers an excerpt of its contribution.
+    Every other persona addressed by name remembers the sentences addressed to it.
+
+    Returns:
+        Only the memories that changed, to be merged by `merge_persona_memories`.
+    """
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    source = speaker.name if speaker else "Human boss"
+    updates = {}
+
+    if speaker is not None:
+        memory = memories.get(speaker.name, PersonaMemory())
+        updates[speaker.name] = memory.model_copy(update={
+            "stance_excerpts": (memory.stance_excerpts + [_stance_excerpt(content, speaker)])[-max_items:]
+        })
+
+    sentences = _split_sentences(content)
+    for persona in personas:
+        if speaker is not None and persona.name == speaker.name:
+            continue
+        addressed = [s for s in sentences if _mentions(s, persona)]
+        if not addressed:
+            continue
+        memory = memories.get(persona.name, PersonaMemory())
+        point = _shorten(f"{source}: {' '.join(addressed)}")
+        updates[persona.name] = memory.model_copy(update={
+            "addressed_points": (memory.addressed_points + [point])[-max_items:]
+        })
+
+    return updates
@@ -0,0 +1,271 @@
+"""
+Tracing
+
+Configurable tracing for the brainstorm graph. Supports two exporters:
+
+* ``jsonl``     → sampled spans written to a local JSONL file by a background thread.
+* ``langsmith`` → the LangSmith network exporter (requires LANGSMITH_API_KEY).
+
+When tracing is disabled nothing is attached to the graph, so there is no overhead.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphInterrupt
+
+from agent_storming.utils import ensure_env
+
+
+# Number of finished runs remembered per tracer to attach late child runs to their trace
+MAX_FINISHED_RUNS = 10000
+
+
+class JsonlSpanExporter:
+    """
+    Appends finished spans to a JSONL file from a daemon thread.
+
+    Spans are queued without blocking; when the queue is full new spans are dropped
+    rather than slowing down the graph.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        batch_size: int = 50,
+        flush_interval_seconds: float = 2.0,
+        max_queue_size: int = 10000,
+    ):
+        self.output_path = Path(output_path)
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.dropped_spans = 0
+        self._reported_dropped_spans = 0
+        self._dropped_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def export(self, span: dict):
+        """Queue a span for writing. Never blocks the caller."""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped_spans += 1
+
+    def shutdown(self):
+        """Flush pending spans and stop the background thread."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        if self.dropped_spans:
+            logging.warning(f"Trace exporter dropped {self.dropped_spans} spans in total (queue full)")
+
+    def _run(self):
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+            self._report_dropped_spans()
+
+    def _report_dropped_spans(self):
+        """Log spans dropped since the last report so that data loss is not silent."""
+        with self._dropped_lock:
+            newly_dropped = self.dropped_spans - self._reported_dropped_spans
+            self._reported_dropped_spans = self.dropped_spans
+        if newly_dropped:
+            logging.warning(f"Trace exporter queue full: dropped {newly_dropped} spans")
+
+    def _next_batch(self) -> List[dict]:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or (self._stop.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[dict]):
+        try:
+            with open(self.output_path, "a", encoding="utf-8") as file:
+                file.write("".join(json.dumps(span, default=str) + "\n" for span in batch))
+        except Exception as e:
+            logging.error(f"Failed to write {len(batch)} trace spans to {self.output_path}: {e}")
+
+
+class SampledTracer(BaseCallbackHandler):
+    """
+    LangChain callback handler that records chain, LLM and tool runs as spans.
+
+    The sampling decision is taken once per trace (at the root run) and inherited
+    by every child run, so a trace is either recorded completely or not at all.
+    """
+
+    raise_error = False
+
+    def __init__(self, exporter: JsonlSpanExporter, sample_rate: float = 1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        # run_id -> open span, only for runs that belong to a sampled trace
+        self._open_spans: Dict[UUID, dict] = {}
+        # run_id -> trace_id of recently finished sampled runs, for children that start
+        # after their parent ended (e.g. background chat compression)
+        self._finished_runs: "OrderedDict[UUID, UUID]" = OrderedDict()
+        self._finished_runs_lock = threading.Lock()
+
+    def _start(self, kind: str, name: Optional[str], run_id: UUID, parent_run_id: Optional[UUID], metadata: Optional[dict]):
+        if parent_run_id is None:
+            if random.random() >= self.sample_rate:
+                return
+            trace_id = run_id
+        else:
+            parent = self._open_spans.get(parent_run_id)
+            if parent is not None:
+                trace_id = parent["trace_id"]
+            else:
+                with self._finished_runs_lock:
+                    trace_id = self._finished_runs.get(parent_run_id)
+                if trace_id is None:
+                    return  # trace was not sampled
+
+        self._open_spans[run_id] = {
+            "trace_id": trace_id,
+            "span_id": run_id,
+            "parent_span_id": parent_run_id,
+            "kind": kind,
+            "name": name,
+            "node": (metadata or {}).get("langgraph_node"),
+            "thread_id": (metadata or {}).get("thread_id"),
+            "start_time": time.time(),
+        }
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attributes):
+        span = self._open_spans.pop(run_id, None)
+        if span is None:
+            return
+        with self._finished_runs_lock:
+            self._finished_runs[run_id] = span["trace_id"]
+            if len(self._finished_runs) > MAX_FINISHED_RUNS:
+                self._finished_runs.popitem(last=False)
+        end_time = time.time()
+        span["end_time"] = end_time
+        span["duration_ms"] = round((end_time - span["start_time"]) * 1000, 3)
+        span["status"] = self._status(error)
+        span.update({k: v for k, v in attributes.items() if v is not None})
+        self.exporter.export(span)
+
+    @staticmethod
+    def _status(error: Optional[BaseException]) -> str:
+        if error is None:
+            return "ok"
+        if isinstance(error, GraphInterrupt):
+            return "interrupted"  # human-in-the-loop pause, not a failure
+        return type(error).__name__
+
+    @staticmethod
+    def _name(serialized: Optional[dict], kwargs: dict) -> Optional[str]:
+        if kwargs.get("name"):
+            return kwargs["name"]
+        if serialized:
+            return serialized.get("name") or (serialized.get("id") or [None])[-1]
+        return None
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start("chain", self._name(serialized, kwargs), run_id, parent_run_id, metadata)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start("llm", self._name(serialized, kwargs), run_id, parent_run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start("llm", self._name(serialized, kwargs), run_id, parent_run_id, metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        token_usage = (response.llm_output or {}).get("token_usage")
+        if token_usage is None:
+            generation = response.generations[0][0] if response.generations and response.generations[0] else None
+            message = getattr(generation, "message", None)
+            token_usage = getattr(message, "usage_metadata", None)
+        self._end(run_id, token_usage=token_usage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start("tool", self._name(serialized, kwargs), run_id, parent_run_id, metadata)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error)
+
+
+# One exporter per output file, shared by all graphs built in this process
+_exporters: Dict[str, JsonlSpanExporter] = {}
+_exporters_lock = threading.Lock()
+
+
+def _get_jsonl_exporter(tracing_config: dict) -> JsonlSpanExporter:
+    output_path = str(tracing_config.get("output_path", "traces/agent_storm_traces.jsonl"))
+    with _exporters_lock:
+        if output_path not in _exporters:
+            _exporters[output_path] = JsonlSpanExporter(
+                output_path=output_path,
+                batch_size=tracing_config.get("batch_size", 50),
+                flush_interval_seconds=tracing_config.get("flush_interval_seconds", 2.0),
+            )
+        return _exporters[output_path]
+
+
+def instrument_graph(graph: Any, tracing_config: Optional[dict]):
+    """
+    Attach tracing to a compiled graph according to the `tracing` config section.
+
+    Returns the graph unchanged when tracing is disabled.
+    """
+    tracing_config = tracing_config or {}
+    if not tracing_config.get("enabled", False):
+        return graph
+
+    exporter = tracing_config.get("exporter", "jsonl")
+    sample_rate = float(tracing_config.get("sample_rate", 1.0))
+
+    if exporter == "langsmith":
+        ensure_env("LANGSMITH_API_KEY")
+        os.environ["LANGSMITH_TRACING"] = "true"
+        os.environ["LANGSMITH_PROJECT"] = tracing_config.get("project", "agent-storming")
+        os.environ["LANGSMITH_TRACING_SAMPLING_RATE"] = str(sample_rate)
+        return graph
+
+    if exporter == "jsonl":
+        tracer = SampledTracer(_get_jsonl_exporter(tracing_config), sample_rate=sample_rate)
+        return graph.with_config(callbacks=[tracer])
+
+    raise ValueError(f"Unknown tracing exporter: {exporter}")
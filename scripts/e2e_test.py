@@ -1,5 +1,4 @@
 
-import os
 import uuid
 from pathlib import Path
 import logging
@@ -14,6 +13,7 @@ from agent_storming.persona_agent import PersonaAgent
 from agent_storming.moderator_agent import BrainstormAgent
 from agent_storming.utils import ensure_env
 from agent_storming.config_loader import load_config
+from agent_storming.tracing import instrument_graph
 
 
 logging.basicConfig(level=logging.INFO)
@@ -28,10 +28,6 @@ def run_brainstorm_session():
 
     ensure_env("OPENAI_API_KEY")
     ensure_env("TAVILY_API_KEY")
-    ensure_env("LANGSMITH_API_KEY")
-
-    os.environ["LANGSMITH_TRACING"] = "true"
-    os.environ["LANGSMITH_PROJECT"] = "agent-storming"
 
     PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
@@ -52,7 +48,9 @@ def run_brainstorm_session():
         llm=llm,
         tavily_search=tavily_search,
         search_instructions_path=PROMPTS_DIR /"web_search_instructions.txt",
-        opinion_instructions_path=PROMPTS_DIR /"generate_opinion_instructions.txt"
+        opinion_instructions_path=PROMPTS_DIR /"generate_opinion_instructions.txt",
+        RECENT_MESSAGES_IN_PROMPT=config["brainstorm"]["recent_messages_in_prompt"],
+        MAX_MEMORY_ITEMS=config["brainstorm"]["max_persona_memory_items"],
     )
 
     # Build orchestrator
@@ -64,10 +62,11 @@ def run_brainstorm_session():
         compress_chat_instructions_path=PROMPTS_DIR /"compress_chat_instructions.txt",
         summarize_meeting_instructions_path=PROMPTS_DIR /"summarize_meeting_instructions.txt",
         MAX_MESSAGES_BEFORE_COMPRESSION=config["brainstorm"]["max_messages_before_compression"],
+        MAX_MESSAGES_HARD_LIMIT=config["brainstorm"].get("max_messages_hard_limit"),
     )
 
     # Final graph
-    graph = brainstorm_agent.build_graph()
+    graph = instrument_graph(brainstorm_agent.build_graph(), config.get("tracing"))
 
     thread_id = str(uuid.uuid4())
     topic = "Who did really build the pyramids and how were they built?"
@@ -0,0 +1,320 @@
+"""
+Load test
+
+Drives many concurrent simulated brainstorm sessions through BrainstormAgent.build_graph()
+against local stand-in LLM and search backends with realistic latency, and reports
+throughput, turn latency, memory growth, checkpoint counts and contention on the
+moderator's compression lock for each concurrency level.
+
+The compression lock only guards the bookkeeping of background chat compressions
+(a dict lookup per turn), so its contention is expected to stay near zero; a growing
+value means sessions are serialized on it. MemorySaver itself uses no lock.
+
+Example:
+    PYTHONPATH=. python scripts/load_test.py --sessions 1,4,16,64 --turns 6 --think-time 0.5
+"""
+
+import re
+import sys
+import time
+import uuid
+import random
+import logging
+import argparse
+import resource
+import threading
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command
+
+from agent_storming.persona_factory import PersonaFactoryAgent, Persona, Perspectives
+from agent_storming.persona_agent import PersonaAgent, SearchQuery
+from agent_storming.moderator_agent import BrainstormAgent
+from agent_storming.config_loader import load_config
+
+
+logging.basicConfig(level=logging.INFO)
+
+PERSONA_NAMES = [
+    "Ada Park", "Ben Okafor", "Chloe Martin", "Diego Alvarez", "Elif Demir",
+    "Farah Haddad", "Gustav Lind", "Hana Sato", "Ivan Petrov", "Julia Costa",
+]
+
+HUMAN_TURNS = [
+    "What do you think?",
+    "What are the main risks with this approach?",
+    "",
+    "Can you compare the costs of the options discussed so far?",
+    "{persona}, do you agree with the previous point?",
+    "What would you do first?",
+]
+
+LOREM = (
+    "the team should weigh cost latency reliability and operational complexity before "
+    "committing to any option because each choice constrains later decisions"
+).split()
+
+
+class StandInLLM:
+    """
+    Local replacement for the chat model. Sleeps for a latency proportional to the
+    generated length and returns plausible responses for every prompt of the graph.
+    """
+
+    def __init__(self, base_latency_ms: float, per_token_latency_ms: float, response_words: int):
+        self.base_latency_ms = base_latency_ms
+        self.per_token_latency_ms = per_token_latency_ms
+        self.response_words = response_words
+
+    def _sleep(self, output_tokens: int):
+        latency_ms = self.base_latency_ms + self.per_token_latency_ms * output_tokens
+        time.sleep(latency_ms * random.uniform(0.5, 1.5) / 1000)
+
+    def _text(self, words: int) -> str:
+        return " ".join(random.choice(LOREM) for _ in range(words)) + "."
+
+    def invoke(self, messages, config=None):
+        words = random.randint(self.response_words // 2, self.response_words)
+        self._sleep(words)
+        return AIMessage(content=self._text(words))
+
+    def with_structured_output(self, schema):
+        return _StandInStructuredLLM(self, schema)
+
+
+class _StandInStructuredLLM:
+    def __init__(self, llm: StandInLLM, schema):
+        self.llm = llm
+        self.schema = schema
+
+    def invoke(self, messages, config=None):
+        system_message = messages[0].content
+
+        if self.schema is Perspectives:
+            max_personas = int(re.search(r"Pick the top (\d+) themes", system_message).group(1))
+            self.llm._sleep(60 * max_personas)
+            return Perspectives(personas=[
+                Persona(name=name, role=f"Expert {i}", description=self.llm._text(20))
+                for i, name in enumerate(random.sample(PERSONA_NAMES, max_personas))
+            ])
+
+        if self.schema is Persona:
+            self.llm._sleep(40)
+            name = random.choice(re.findall(r"Name: (.*)", system_message))
+            return Persona(name=name, role="Expert", description=self.llm._text(20))
+
+        if self.schema is SearchQuery:
+            self.llm._sleep(30)
+            return SearchQuery(search_query=self.llm._text(12))
+
+        raise ValueError(f"Unsupported structured output: {self.schema}")
+
+
+class StandInSearch:
+    """Local replacement for TavilySearch."""
+
+    def __init__(self, latency_ms: float, max_results: int):
+        self.latency_ms = latency_ms
+        self.max_results = max_results
+
+    def invoke(self, query: dict):
+        time.sleep(self.latency_ms * random.uniform(0.5, 1.5) / 1000)
+        return {"results": [
+            {"url": f"https://example.com/{uuid.uuid4().hex[:8]}", "content": " ".join(random.choices(LOREM, k=80))}
+            for _ in range(self.max_results)
+        ]}
+
+
+class ContentionLock:
+    """Drop-in replacement for threading.Lock that counts contended acquisitions and wait time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(blocking=False):
+            acquired = True
+        elif not blocking:
+            return False
+        else:
+            start = time.perf_counter()
+            acquired = self._lock.acquire(timeout=timeout)
+            self.wait_seconds += time.perf_counter() - start
+            self.contended += 1
+        if acquired:
+            self.acquisitions += 1
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def current_rss_mb() -> float:
+    """Current resident set size of this process in MB (peak RSS if /proc is not available)."""
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def count_checkpoints(checkpointers) -> int:
+    return sum(1 for saver in checkpointers for _ in saver.list(None))
+
+
+def percentile(values, q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run_session(graph, args, turn_latencies: list):
+    """Run one scripted session: persona generation, feedback, discussion turns and summary."""
+    thread = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    state = graph.invoke({"topic": "Choosing a cloud provider for our application.", "max_personas": args.personas},
+                         thread, subgraphs=True)
+
+    # Optional feedback rounds on the personas, then accept them
+    for feedback in ["Please add a security expert."] * args.feedback_rounds + [None]:
+        time.sleep(args.think_time)
+        parent_graph_state = graph.get_state(thread, subgraphs=True)
+        graph.update_state(parent_graph_state.tasks[0].state.config, {"human_boss_feedback": feedback},
+                           as_node="human_feedback")
+        state = graph.invoke(None, thread, subgraphs=True)
+
+    for turn in range(args.turns):
+        time.sleep(args.think_time)
+        persona = random.choice(state["personas"]).name if state.get("personas") else ""
+        human_input = HUMAN_TURNS[turn % len(HUMAN_TURNS)].format(persona=persona)
+        start = time.perf_counter()
+        state = graph.invoke(Command(resume={"human_input": human_input}), thread, subgraphs=True)
+        turn_latencies.append(time.perf_counter() - start)
+
+    time.sleep(args.think_time)
+    graph.invoke(Command(resume={"human_input": "end"}), thread, subgraphs=True)
+
+
+def build_load_test_graph(args):
+    """Build the real brainstorm graph on top of the stand-in backends."""
+    project_root = Path(__file__).parent.parent
+    config = load_config(project_root / "agent_storming/config.yaml")
+    prompts_dir = project_root / "prompts"
+
+    llm = StandInLLM(args.llm_latency_ms, args.llm_token_latency_ms, args.response_words)
+    search = StandInSearch(args.search_latency_ms, config["search"]["max_results"])
+    checkpointers = [MemorySaver(), MemorySaver(), MemorySaver()]
+    compression_lock = ContentionLock()
+
+    factory_agent = PersonaFactoryAgent(
+        llm=llm,
+        create_personas_instructions_path=prompts_dir / "create_personas_instructions.txt",
+        checkpointer=checkpointers[0],
+    )
+    persona_agent = PersonaAgent(
+        llm=llm,
+        tavily_search=search,
+        search_instructions_path=prompts_dir / "web_search_instructions.txt",
+        opinion_instructions_path=prompts_dir / "generate_opinion_instructions.txt",
+        RECENT_MESSAGES_IN_PROMPT=config["brainstorm"]["recent_messages_in_prompt"],
+        MAX_MEMORY_ITEMS=config["brainstorm"]["max_persona_memory_items"],
+        checkpointer=checkpointers[1],
+    )
+    brainstorm_agent = BrainstormAgent(
+        llm=llm,
+        persona_factory_agent=factory_agent,
+        persona_agent=persona_agent,
+        coordinator_instructions_path=prompts_dir / "coordinator_instructions.txt",
+        compress_chat_instructions_path=prompts_dir / "compress_chat_instructions.txt",
+        summarize_meeting_instructions_path=prompts_dir / "summarize_meeting_instructions.txt",
+        MAX_MESSAGES_BEFORE_COMPRESSION=config["brainstorm"]["max_messages_before_compression"],
+        MAX_MESSAGES_HARD_LIMIT=config["brainstorm"].get("max_messages_hard_limit"),
+        checkpointer=checkpointers[2],
+        compression_lock=compression_lock,
+    )
+
+    return brainstorm_agent.build_graph(), checkpointers, compression_lock
+
+
+def run_load_test(args):
+    graph, checkpointers, compression_lock = build_load_test_graph(args)
+    baseline_rss = current_rss_mb()
+
+    header = (f"{'sessions':>8} {'failed':>6} {'sess/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+              f"{'RSS MB':>8} {'ΔRSS MB':>8} {'ckpts':>8} {'cmp-lock acq':>12} {'cmp-lock contended':>18} {'cmp-lock wait ms':>16}")
+    rows = []
+
+    for num_sessions in args.sessions:
+        logging.info(f"Running {num_sessions} concurrent sessions...")
+        turn_latencies = []
+        lock_before = (compression_lock.acquisitions, compression_lock.contended, compression_lock.wait_seconds)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=num_sessions) as executor:
+            futures = [executor.submit(run_session, graph, args, turn_latencies) for _ in range(num_sessions)]
+        failed = 0
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                logging.error(f"Session failed: {e}")
+        elapsed = time.perf_counter() - start
+
+        rss = current_rss_mb()
+        rows.append(
+            f"{num_sessions:>8} {failed:>6} {(num_sessions - failed) / elapsed:>7.2f} "
+            f"{percentile(turn_latencies, 50):>7.2f} {percentile(turn_latencies, 95):>7.2f} "
+            f"{percentile(turn_latencies, 99):>7.2f} {rss:>8.1f} {rss - baseline_rss:>8.1f} "
+            f"{count_checkpoints(checkpointers):>8} "
+            f"{compression_lock.acquisitions - lock_before[0]:>12} "
+            f"{compression_lock.contended - lock_before[1]:>18} "
+            f"{(compression_lock.wait_seconds - lock_before[2]) * 1000:>16.2f}"
+        )
+
+    print()
+    print(header)
+    print("\n".join(rows))
+    print("\nRSS, ΔRSS (vs. start) and checkpoint counts are cumulative: all sessions stay in the in-memory checkpointers.")
+    print("cmp-lock columns: acquisitions, contended acquisitions and total wait time of the moderator's "
+          "compression bookkeeping lock (expected near zero).")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the brainstorm graph.")
+    parser.add_argument("--sessions", type=lambda s: [int(n) for n in s.split(",")], default=[1, 2, 4, 8, 16],
+                        help="Comma-separated concurrency levels to ramp through (default: 1,2,4,8,16).")
+    parser.add_argument("--turns", type=int, default=6, help="Discussion turns per session.")
+    parser.add_argument("--personas", type=int, default=3, help="Personas per session.")
+    parser.add_argument("--feedback-rounds", type=int, default=1, help="Persona feedback rounds per session.")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Simulated human think-time in seconds.")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="Base latency of each LLM call.")
+    parser.add_argument("--llm-token-latency-ms", type=float, default=5, help="Additional LLM latency per output token.")
+    parser.add_argument("--search-latency-ms", type=float, default=400, help="Latency of each web search.")
+    parser.add_argument("--response-words", type=int, default=200, help="Maximum length of LLM text responses.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    random.seed(args.seed)
+    run_load_test(args)
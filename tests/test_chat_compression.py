@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+
+from agent_storming.moderator_agent import BrainstormAgent
+
+
+PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+CONFIG = {"configurable": {"thread_id": "thread-1"}}
+
+
+class StubLLM:
+    def __init__(self):
+        self.calls = []
+
+    def invoke(self, messages, config=None):
+        self.calls.append((messages, config))
+        return AIMessage(content="sync summary", id="sync-summary")
+
+
+def make_agent(llm=None, soft_limit=4, hard_limit=8):
+    return BrainstormAgent(
+        llm=llm or StubLLM(),
+        persona_factory_agent=None,
+        persona_agent=None,
+        coordinator_instructions_path=PROMPTS_DIR / "coordinator_instructions.txt",
+        compress_chat_instructions_path=PROMPTS_DIR / "compress_chat_instructions.txt",
+        summarize_meeting_instructions_path=PROMPTS_DIR / "summarize_meeting_instructions.txt",
+        MAX_MESSAGES_BEFORE_COMPRESSION=soft_limit,
+        MAX_MESSAGES_HARD_LIMIT=hard_limit,
+    )
+
+
+def make_messages(count):
+    return [
+        HumanMessage(content=f"human {i}", id=f"m{i}") if i % 2 == 0 else AIMessage(content=f"ai {i}", id=f"m{i}")
+        for i in range(count)
+    ]
+
+
+def add_pending(agent, compressed_ids, future):
+    agent._pending_compressions[CONFIG["configurable"]["thread_id"]] = (compressed_ids, future)
+
+
+def test_hard_limit_must_exceed_soft_limit():
+    with pytest.raises(ValueError):
+        make_agent(soft_limit=10, hard_limit=5)
+
+
+def test_compress_chat_history_starts_background_compression_with_node_config():
+    llm = StubLLM()
+    agent = make_agent(llm)
+
+    assert agent.compress_chat_history({"messages": make_messages(4)}, CONFIG) == {}
+    assert agent._pending_compressions == {}
+
+    assert agent.compress_chat_history({"messages": make_messages(6)}, CONFIG) == {}
+    compressed_ids, future = agent._pending_compressions["thread-1"]
+    assert compressed_ids == ["m0", "m1", "m2", "m3"]
+    assert future.result(timeout=5).content == "sync summary"
+    assert llm.calls[0][1] is CONFIG
+
+
+def test_finished_compression_is_applied():
+    agent = make_agent()
+    messages = make_messages(6)
+    future = Future()
+    future.set_result(AIMessage(content="background summary", id="summary"))
+    add_pending(agent, ["m0", "m1", "m2", "m3"], future)
+
+    compacted, removals = agent._apply_chat_compression(messages, CONFIG)
+
+    assert [m.content for m in compacted] == ["background summary", "human 4", "ai 5"]
+    # kept messages are copies with new ids, so removing the originals doesn't remove them
+    assert all(m.id is None for m in compacted[1:])
+    assert all(isinstance(r, RemoveMessage) for r in removals)
+    assert [r.id for r in removals] == [m.id for m in messages]
+    assert agent._pending_compressions == {}
+
+
+def test_unfinished_compression_is_kept_under_the_hard_limit():
+    llm = StubLLM()
+    agent = make_agent(llm)
+    messages = make_messages(6)
+    future = Future()
+    add_pending(agent, ["m0", "m1", "m2", "m3"], future)
+
+    assert agent._apply_chat_compression(messages, CONFIG) == (messages, [])
+    assert agent._pending_compressions["thread-1"][1] is future
+    assert not future.cancelled()
+    assert llm.calls == []
+
+
+def test_unfinished_compression_is_cancelled_when_meeting_ends():
+    agent = make_agent()
+    messages = make_messages(6)
+    future = Future()
+    add_pending(agent, ["m0", "m1", "m2", "m3"], future)
+
+    assert agent._apply_chat_compression(messages, CONFIG, meeting_ended=True) == (messages, [])
+    assert future.cancelled()
+    assert agent._pending_compressions == {}
+
+
+def test_stale_compression_is_dropped():
+    agent = make_agent()
+    messages = make_messages(6)
+    future = Future()
+    future.set_result(AIMessage(content="stale summary"))
+    add_pending(agent, ["other", "m1", "m2", "m3"], future)
+
+    assert agent._apply_chat_compression(messages, CONFIG) == (messages, [])
+    assert agent._pending_compressions == {}
+
+
+def test_synchronous_compression_over_the_hard_limit_without_result():
+    llm = StubLLM()
+    agent = make_agent(llm)
+    messages = make_messages(10)
+
+    compacted, removals = agent._apply_chat_compression(messages, CONFIG)
+
+    assert len(llm.calls) == 1
+    prompt = llm.calls[0][0][0].content
+    assert "ai 7" in prompt and "human 8" not in prompt
+    assert [m.content for m in compacted] == ["sync summary", "human 8", "ai 9"]
+    assert len(removals) == 10
+
+
+def test_unfinished_compression_is_awaited_over_the_hard_limit():
+    llm = StubLLM()
+    agent = make_agent(llm)
+    messages = make_messages(10)
+    future = Future()
+    add_pending(agent, ["m0", "m1", "m2", "m3"], future)
+    threading.Timer(0.05, future.set_result, [AIMessage(content="background summary")]).start()
+
+    compacted, _ = agent._apply_chat_compression(messages, CONFIG)
+
+    assert llm.calls == []
+    assert [m.content for m in compacted] == ["background summary"] + [m.content for m in messages[4:]]
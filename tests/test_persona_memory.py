@@ -0,0 +1,69 @@
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent_storming.persona_factory import Persona
+from agent_storming.persona_memory import PersonaMemory, update_persona_memories
+
+
+def make_persona(name: str) -> Persona:
+    return Persona(name=name, role="Expert", description="Test persona.")
+
+
+JANE = make_persona("Dr. Jane Smith")
+BOB = make_persona("Bob Jones")
+PERSONAS = [JANE, BOB]
+
+
+def test_addressed_points_are_extracted_for_mentioned_personas():
+    message = HumanMessage(content="Jane, what are the risks? Let us move on. Dr. Smith also mentioned costs.")
+
+    updates = update_persona_memories({}, PERSONAS, message)
+
+    assert set(updates) == {JANE.name}
+    assert updates[JANE.name].addressed_points == [
+        "Human boss: Jane, what are the risks? Dr. Smith also mentioned costs."
+    ]
+    assert updates[JANE.name].stance_excerpts == []
+
+
+def test_title_alone_does_not_count_as_a_mention():
+    message = HumanMessage(content="The Dr. on call was not reached.")
+
+    assert update_persona_memories({}, PERSONAS, message) == {}
+
+
+def test_common_word_names_are_only_matched_when_addressed():
+    will = make_persona("Will Turner")
+    grace = make_persona("Dr. Grace Long")
+    personas = [will, grace]
+
+    ordinary = AIMessage(content="We will need a long-term plan. By God's grace this will work. Will it scale?")
+    assert update_persona_memories({}, personas, ordinary) == {}
+
+    addressed = HumanMessage(content="Will, can you estimate it? Dr. Long should review. What do you think, Grace?")
+    updates = update_persona_memories({}, personas, addressed)
+
+    assert updates[will.name].addressed_points == ["Human boss: Will, can you estimate it?"]
+    assert updates[grace.name].addressed_points == ["Human boss: Dr. Long should review. What do you think, Grace?"]
+
+
+def test_speaker_remembers_stance_and_conclusion_and_is_not_addressed_by_itself():
+    message = AIMessage(content=(
+        "Bob Jones, database expert. I recommend Postgres. It is cheap. "
+        "Jane, can you check the costs? Overall, Postgres fits best."
+    ))
+
+    updates = update_persona_memories({}, PERSONAS, message, speaker=BOB)
+
+    assert updates[BOB.name].stance_excerpts == ["I recommend Postgres. ... Overall, Postgres fits best."]
+    assert updates[BOB.name].addressed_points == []
+    assert updates[JANE.name].addressed_points == ["Bob Jones: Jane, can you check the costs?"]
+
+
+def test_memory_items_are_trimmed_to_max_items():
+    memories = {BOB.name: PersonaMemory(stance_excerpts=["first", "second"])}
+
+    for i in range(3):
+        message = AIMessage(content=f"Position {i}.")
+        memories.update(update_persona_memories(memories, PERSONAS, message, speaker=BOB, max_items=3))
+
+    assert memories[BOB.name].stance_excerpts == ["Position 0.", "Position 1.", "Position 2."]
@@ -0,0 +1,9 @@
+from langgraph.errors import GraphInterrupt
+
+from agent_storming.tracing import SampledTracer
+
+
+def test_interrupts_are_not_reported_as_errors():
+    assert SampledTracer._status(None) == "ok"
+    assert SampledTracer._status(GraphInterrupt()) == "interrupted"
+    assert SampledTracer._status(ValueError("boom")) == "ValueError"